@@ -1,146 +1,208 @@
-import requests
+import argparse
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
-from tabulate import tabulate
-
-# Step 1: Ask the user to input the URL for the mutual fund data
-url = input("Please enter the URL for the mutual fund data: ")
-
-# Fetch data from the provided URL
-response = requests.get(url)
-data = response.json()
-
-# Extract the scheme name from the API data
-scheme_name = data['meta']['scheme_name']
-print(f"\n📊 CAGR Analysis for: \033[1m{scheme_name}\033[0m\n")
-
-# Step 2: Prepare NAV DataFrame
-df = pd.DataFrame(data['data'])
-df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y')
-df['nav'] = pd.to_numeric(df['nav'])
-df = df.sort_values('date').reset_index(drop=True)
-
-# Print minimum available date
-min_date = df['date'].min().date()
-print(f"📅 Minimum available NAV date: {min_date}")
-
-# Step 3: Ask user how many years to analyze
-years_input = input("Enter number of years to analyze for SIP CAGR (e.g., 1, 5, 10 or 'all'): ").strip().lower()
-if years_input == 'all':
-    sip_start_date = df['date'].min()
-else:
-    try:
-        years_to_analyze = int(years_input)
-        sip_start_date = df['date'].max() - pd.DateOffset(years=years_to_analyze)
-    except ValueError:
-        print("Invalid input for number of years. Using full data instead.")
-        sip_start_date = df['date'].min()
-
-sip_end_date = df['date'].max()
-
-# Step 4: Define SIP parameters
-investment_amount = 50000
-cagr_results = {}
-
-# Step 5: Simulate SIP for each date of the month
-for sip_day in range(1, 32):
-    sip_investments = []
-    current = datetime(sip_start_date.year, sip_start_date.month, 1)
-
-    while current <= sip_end_date:
-        try:
-            invest_date = current.replace(day=sip_day)
-        except ValueError:
-            current += timedelta(days=32)
-            current = current.replace(day=1)
-            continue
-
-        nav_row = df[df['date'] >= invest_date]
-        if not nav_row.empty:
-            sip_investments.append(nav_row.iloc[0])
-
-        # Move to next month
-        next_month = current.month + 1 if current.month < 12 else 1
-        next_year = current.year if current.month < 12 else current.year + 1
-        current = datetime(next_year, next_month, 1)
-
-    if len(sip_investments) < 12:
-        continue
-
-    sip_df = pd.DataFrame(sip_investments)
-    total_units = (investment_amount / sip_df['nav']).sum()
-    total_invested = len(sip_df) * investment_amount
-    final_value = total_units * df.iloc[-1]['nav']
-    actual_years = (df.iloc[-1]['date'] - sip_df.iloc[0]['date']).days / 365.25
-    cagr = (final_value / total_invested) ** (1 / actual_years) - 1
-
-    cagr_results[sip_day] = {
-        'Day': f"{sip_day:02d}",
-        'CAGR (%)': round(cagr * 100, 2),
-        'Final Value (₹)': f"{final_value:,.2f}",
-        'Total Invested (₹)': f"{total_invested:,.2f}"
-    }
-
-# Step 6: User choice for top 5 or all
-choice = input("Do you want to see [1] Top 5 dates or [2] CAGR for all dates? Enter 1 or 2: ")
-
-if choice.strip() == '1':
-    result_list = sorted(cagr_results.values(), key=lambda x: float(x['CAGR (%)']), reverse=True)[:5]
-else:
-    result_list = sorted(cagr_results.values(), key=lambda x: int(x['Day']))
-
-# Step 7: Display table for SIP dates
-print("\n📅 SIP Date-wise CAGR Results:")
-print(tabulate(result_list, headers="keys", tablefmt="fancy_grid"))
-
-# Step 8: Calculate Advertised CAGR (always use full dataset)
-def calculate_cagr(start_nav, end_nav, years):
-    return (end_nav / start_nav) ** (1 / years) - 1 if years > 0 else 0
-
-def calculate_estimated_amount(cagr, years, initial_investment):
-    return initial_investment * (1 + cagr) ** years
-
-# Dates for advertised CAGR
-current_date = datetime.now()
-one_year_ago = current_date - timedelta(days=365)
-five_years_ago = current_date - timedelta(days=365*5)
-ten_years_ago = current_date - timedelta(days=365*10)
+from datetime import datetime
+from nav_data import estimated_amount_from_navs, load_nav
 
-# NAV lookups (handle missing gracefully)
 try:
-    nav_1_year_ago = df[df['date'] <= one_year_ago].iloc[-1]['nav']
-    cagr_1_year = calculate_cagr(nav_1_year_ago, df.iloc[-1]['nav'], 1)
-    estimated_1_year = calculate_estimated_amount(cagr_1_year, 1, 500000)
-except:
-    cagr_1_year = estimated_1_year = None
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+NS_PER_DAY = 86_400_000_000_000
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def sip_sweep(dates_i8, inv_navs, month_starts_i8, month_lengths):
+        # For each SIP day, walk the months and binary-search the first NAV on
+        # or after the investment date. Returns per-day units bought, number of
+        # instalments and index of the first instalment (-1 if none).
+        n = dates_i8.size
+        units_sum = np.zeros(31)
+        counts = np.zeros(31, dtype=np.int64)
+        first_idx = np.full(31, -1, dtype=np.int64)
+        for day in prange(31):
+            for m in range(month_starts_i8.size):
+                if day >= month_lengths[m]:
+                    continue
+                target = month_starts_i8[m] + day * NS_PER_DAY
+                lo, hi = 0, n
+                while lo < hi:
+                    mid = (lo + hi) // 2
+                    if dates_i8[mid] < target:
+                        lo = mid + 1
+                    else:
+                        hi = mid
+                if lo < n:
+                    units_sum[day] += inv_navs[lo]
+                    counts[day] += 1
+                    if first_idx[day] < 0:
+                        first_idx[day] = lo
+        return units_sum, counts, first_idx
+
+INVESTMENT_AMOUNT = 50000
 
-try:
-    nav_5_years_ago = df[df['date'] <= five_years_ago].iloc[-1]['nav']
-    cagr_5_year = calculate_cagr(nav_5_years_ago, df.iloc[-1]['nav'], 5)
-    estimated_5_year = calculate_estimated_amount(cagr_5_year, 5, 500000)
-except:
-    cagr_5_year = estimated_5_year = None
+def calculate_cagr(start_nav, end_nav, years):
+    return (end_nav / start_nav) ** (1 / years) - 1 if years > 0 else 0
 
-try:
-    nav_10_years_ago = df[df['date'] <= ten_years_ago].iloc[-1]['nav']
-    cagr_10_year = calculate_cagr(nav_10_years_ago, df.iloc[-1]['nav'], 10)
-    estimated_10_year = calculate_estimated_amount(cagr_10_year, 10, 500000)
-except:
-    cagr_10_year = estimated_10_year = None
-
-# From earliest
-earliest_date = df['date'].min()
-nav_earliest = df[df['date'] == earliest_date].iloc[0]['nav']
-total_years_available = (df.iloc[-1]['date'] - earliest_date).days / 365.25
-cagr_from_earliest = calculate_cagr(nav_earliest, df.iloc[-1]['nav'], total_years_available)
-estimated_from_earliest = calculate_estimated_amount(cagr_from_earliest, total_years_available, 500000)
-
-# Print the results
-print("\n📈 Advertised CAGR and Estimated Returns (based on full data):")
-if cagr_1_year:
-    print(f"1-Year CAGR: {cagr_1_year * 100:.2f}% → ₹5,00,000 → ₹{estimated_1_year:,.2f}")
-if cagr_5_year:
-    print(f"5-Year CAGR: {cagr_5_year * 100:.2f}% → ₹5,00,000 → ₹{estimated_5_year:,.2f}")
-if cagr_10_year:
-    print(f"10-Year CAGR: {cagr_10_year * 100:.2f}% → ₹5,00,000 → ₹{estimated_10_year:,.2f}")
-print(f"Since {earliest_date.date()} (≈ {total_years_available:.1f} years): {cagr_from_earliest * 100:.2f}% → ₹5,00,000 → ₹{estimated_from_earliest:,.2f}")
+def simulate_sip(df, sip_start_date, investment_amount):
+    # NAVs are sorted by date, so the last row is the valuation point
+    sip_end_date = final_date = df['date'].iat[-1]
+    final_nav = df['nav'].iat[-1]
+    cagr_results = {}
+
+    # Simulate SIP for each date of the month
+    sip_months = pd.date_range(datetime(sip_start_date.year, sip_start_date.month, 1), sip_end_date, freq='MS')
+    nav_dates = df['date'].values
+    # Units bought by one instalment on each NAV date; the same for every SIP day
+    inv_navs = investment_amount / df['nav'].to_numpy(dtype=np.float64)
+
+    if sip_months.size == 0:
+        # Start date after the last NAV (e.g. a negative number of years)
+        return cagr_results
+
+    if njit is not None:
+        # Compiled sweep over plain int64/float64 arrays, one thread per SIP day
+        units_sum, counts, first_idx = sip_sweep(
+            nav_dates.astype('datetime64[ns]').view('i8'),
+            inv_navs,
+            sip_months.values.astype('datetime64[ns]').view('i8'),
+            sip_months.days_in_month.to_numpy(dtype=np.int64),
+        )
+    else:
+        # Lay out every (month, SIP day) target date as one months x 31 grid and
+        # resolve the whole grid against the NAV history with a single
+        # searchsorted call. Days past the end of a month (e.g. 31st of a 30-day
+        # month) are masked out rather than rolled over.
+        days = np.arange(31)
+        targets = sip_months.values.astype('datetime64[D]')[:, None] + days.astype('timedelta64[D]')
+        idxs = np.searchsorted(nav_dates, targets.astype(nav_dates.dtype), side='left')
+        hit = (days < sip_months.days_in_month.to_numpy()[:, None]) & (idxs < nav_dates.size)
+
+        units_sum = np.where(hit, inv_navs.take(np.minimum(idxs, nav_dates.size - 1)), 0.0).sum(axis=0)
+        counts = hit.sum(axis=0)
+        # Months are in ascending order, so the first hit in a column is the first instalment
+        first_idx = np.where(hit.any(axis=0), idxs[hit.argmax(axis=0), days], -1)
+
+    # CAGR for every SIP day with at least a year of instalments, as one array expression
+    days_ok = np.flatnonzero(counts >= 12)
+    final_values = units_sum[days_ok] * final_nav
+    total_invested = counts[days_ok] * investment_amount
+    first_dates = nav_dates[first_idx[days_ok]].astype('datetime64[D]')
+    actual_years = (np.datetime64(final_date, 'D') - first_dates).astype(np.float64) / 365.25
+    cagrs = np.power(final_values / total_invested, 1.0 / actual_years) - 1
+
+    for day_idx, cagr, final_value, invested in zip(days_ok, cagrs, final_values, total_invested):
+        sip_day = int(day_idx) + 1
+        cagr_results[sip_day] = {
+            'Day': f"{sip_day:02d}",
+            'CAGR (%)': round(cagr * 100, 2),
+            'Final Value (₹)': f"{final_value:,.2f}",
+            'Total Invested (₹)': f"{invested:,.2f}"
+        }
+
+    return cagr_results
+
+def print_advertised_cagr(df):
+    # Dates for advertised CAGR
+    current_date = datetime.now()
+    lookback_years = np.array([1, 5, 10])
+    dates = df['date'].values
+    navs = df['nav'].to_numpy()
+    lookback_dates = (np.datetime64(current_date) - (365 * lookback_years).astype('timedelta64[D]')).astype(dates.dtype)
+
+    # NAV lookups: the latest NAV on or before each lookback date, found for all
+    # horizons with one binary search. Horizons older than the history have no
+    # NAV, and neither do lookback dates after the last NAV (a stale or closed
+    # scheme), which would otherwise compare the last NAV with itself.
+    idxs = np.searchsorted(dates, lookback_dates, side='right') - 1
+    has_nav = (idxs >= 0) & (lookback_dates <= dates[-1])
+    nav_lookback = np.where(has_nav, navs[np.clip(idxs, 0, None)], np.nan)
+    cagr_lookback = (navs[-1] / nav_lookback) ** (1 / lookback_years) - 1
+    estimated_lookback = estimated_amount_from_navs(nav_lookback, navs[-1], 500000)
+
+    # From earliest
+    earliest_date = df['date'].iat[0]
+    nav_earliest = navs[0]
+    total_years_available = (df['date'].iat[-1] - earliest_date).days / 365.25
+    cagr_from_earliest = calculate_cagr(nav_earliest, navs[-1], total_years_available)
+    estimated_from_earliest = estimated_amount_from_navs(nav_earliest, navs[-1], 500000)
+
+    # Print the results
+    print("\n📈 Advertised CAGR and Estimated Returns (based on full data):")
+    # Only horizons without history are skipped; a flat 0% CAGR is still shown
+    for years, cagr, estimated in zip(lookback_years, cagr_lookback, estimated_lookback):
+        if not np.isnan(cagr):
+            print(f"{years}-Year CAGR: {cagr * 100:.2f}% → ₹5,00,000 → ₹{estimated:,.2f}")
+    print(f"Since {earliest_date.date()} (≈ {total_years_available:.1f} years): {cagr_from_earliest * 100:.2f}% → ₹5,00,000 → ₹{estimated_from_earliest:,.2f}")
+
+# Runs the full analysis for one fund and returns the displayed SIP table.
+# years_input and choice are prompted for when not given.
+def run(url, years_input=None, choice=None):
+    # Fetch and prepare the NAV DataFrame (served from the local cache when fresh)
+    scheme_name, df = load_nav(url)
+    print(f"\n📊 CAGR Analysis for: \033[1m{scheme_name}\033[0m\n")
+
+    # Print minimum available date (NAVs are sorted by date)
+    first_date = df['date'].iat[0]
+    last_date = df['date'].iat[-1]
+    min_date = first_date.date()
+    print(f"📅 Minimum available NAV date: {min_date}")
+
+    # How many years to analyze
+    if years_input is None:
+        years_input = input("Enter number of years to analyze for SIP CAGR (e.g., 1, 5, 10 or 'all'): ")
+    years_input = str(years_input).strip().lower()
+    if years_input == 'all':
+        sip_start_date = first_date
+    else:
+        try:
+            years_to_analyze = int(years_input)
+            sip_start_date = last_date - pd.DateOffset(years=years_to_analyze)
+        except ValueError:
+            print("Invalid input for number of years. Using full data instead.")
+            sip_start_date = first_date
+
+    cagr_results = simulate_sip(df, sip_start_date, INVESTMENT_AMOUNT)
+
+    # Top 5 or all dates
+    if choice is None:
+        choice = input("Do you want to see [1] Top 5 dates or [2] CAGR for all dates? Enter 1 or 2: ")
+
+    if str(choice).strip() == '1':
+        result_list = sorted(cagr_results.values(), key=lambda x: float(x['CAGR (%)']), reverse=True)[:5]
+    else:
+        result_list = sorted(cagr_results.values(), key=lambda x: int(x['Day']))
+
+    # Display table for SIP dates
+    print("\n📅 SIP Date-wise CAGR Results:")
+    if result_list:
+        print(pd.DataFrame(result_list).to_string(index=False))
+    else:
+        print("No SIP dates with at least 12 instalments in the selected period.")
+
+    # Advertised CAGR (always uses the full dataset)
+    print_advertised_cagr(df)
+
+    return result_list
+
+# Analyzes several funds in one process, sharing the HTTP session and caches
+def run_many(urls, years_input='all', choice='2'):
+    return {url: run(url, years_input, choice) for url in urls}
+
+def main():
+    parser = argparse.ArgumentParser(description="SIP date-wise and advertised CAGR analysis for MFAPI funds")
+    parser.add_argument('--urls', help="file with one MFAPI URL per line; analyzes them all without prompting")
+    parser.add_argument('--years', default='all', help="years to analyze for SIP CAGR with --urls (default: all)")
+    parser.add_argument('--choice', default='2', help="1 for top 5 dates, 2 for all dates with --urls (default: 2)")
+    args = parser.parse_args()
+
+    if args.urls:
+        with open(args.urls) as f:
+            urls = [line.strip() for line in f if line.strip()]
+        run_many(urls, args.years, args.choice)
+    else:
+        run(input("Please enter the URL for the mutual fund data: "))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+import hashlib
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import requests
+
+CACHE_DIR = 'cache'
+# MFAPI publishes NAVs once a day, so anything younger than that is still current
+CACHE_EXPIRY = 86400
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
+
+# Created on the first fetch so that importing this module does not create the
+# HTTP cache database in the current directory
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            if requests_cache is not None:
+                _session = requests_cache.CachedSession('mfapi_cache', expire_after=CACHE_EXPIRY)
+            else:
+                _session = requests.Session()
+        return _session
+
+
+# initial * (1 + cagr) ** years with cagr = (end/start) ** (1/years) - 1
+# reduces to initial * end/start, so the growth is applied directly. Shared by
+# both scripts for lump-sum and resting-period estimates.
+def estimated_amount_from_navs(start_nav, end_nav, initial_investment):
+    return initial_investment * end_nav / start_nav
+
+
+# MFAPI dates are fixed-width 'dd-mm-YYYY' strings. Shuffling the characters
+# into ISO order lets NumPy parse the whole column in C instead of going
+# through a format string per value.
+_ISO_ORDER = [6, 7, 8, 9, 5, 3, 4, 2, 0, 1]
+
+
+def parse_dates(raw_dates):
+    chars = np.asarray(raw_dates, dtype='<U10').view('<U1').reshape(-1, 10)
+    iso = np.ascontiguousarray(chars[:, _ISO_ORDER]).view('<U10').ravel()
+    return iso.astype('datetime64[D]').astype('datetime64[ns]')
+
+
+def _cache_path(url, suffix):
+    return os.path.join(CACHE_DIR, hashlib.sha1(url.encode()).hexdigest() + suffix)
+
+
+# The scheme name goes in a sidecar file rather than df.attrs, which only some
+# pandas versions and parquet engines round-trip
+def _read_cached(url):
+    path = _cache_path(url, '.parquet')
+    name_path = _cache_path(url, '.name')
+    try:
+        written_at = os.path.getmtime(path)
+        if time.time() - written_at > CACHE_EXPIRY:
+            return None
+        with open(name_path, encoding='utf-8') as f:
+            scheme_name = f.read()
+        return written_at, (scheme_name, pd.read_parquet(path))
+    except (ImportError, OSError, ValueError):
+        return None
+
+
+def _write_cached(url, scheme_name, df):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(_cache_path(url, '.name'), 'w', encoding='utf-8') as f:
+            f.write(scheme_name)
+        df.to_parquet(_cache_path(url, '.parquet'))
+    except (ImportError, OSError):
+        # No parquet engine or unwritable directory: run uncached
+        pass
+
+
+# url -> (time the data was fetched, (scheme_name, df))
+_loaded = {}
+
+
+# Returns (scheme_name, df) with NAVs sorted by date. The parsed DataFrame is
+# kept on disk as parquet so repeated runs skip the download, JSON decoding and
+# date parsing altogether, and in memory so a fund is loaded once per
+# CACHE_EXPIRY even in a long-running process. Callers must treat the returned
+# DataFrame as read-only.
+def load_nav(url):
+    entry = _loaded.get(url)
+    if entry is None or time.time() - entry[0] > CACHE_EXPIRY:
+        entry = _read_cached(url) or (time.time(), _fetch_nav(url))
+        _loaded[url] = entry
+    return entry[1]
+
+
+def _fetch_nav(url):
+    response = get_session().get(url)
+    # orjson decodes the thousands of small {date, nav} records noticeably faster
+    data = orjson.loads(response.content) if orjson is not None else response.json()
+    scheme_name = data['meta']['scheme_name']
+
+    records = data['data']
+    df = pd.DataFrame({
+        'date': parse_dates([row['date'] for row in records]),
+        'nav': np.array([row['nav'] for row in records], dtype=np.float64),
+    })
+    df = df.sort_values('date').reset_index(drop=True)
+
+    _write_cached(url, scheme_name, df)
+    return scheme_name, df
@@ -1,18 +1,26 @@
-import requests
+import numpy as np
 import pandas as pd
 import json
-from datetime import datetime, timedelta
-from tabulate import tabulate
+from functools import lru_cache
 import os
+from concurrent.futures import ThreadPoolExecutor
+from nav_data import estimated_amount_from_navs, load_nav
 
 INPUT_FILE = 'mutual_funds_input.json'
+MAX_FETCH_WORKERS = 16
+
+# Keyed on the file's mtime so an edited file is re-read, but an unchanged one
+# is parsed only once per process
+@lru_cache(maxsize=None)
+def _read_input_file(path, mtime):
+    with open(path, 'r') as f:
+        return json.load(f)['funds']
 
 def get_user_input_or_load_file():
     if os.path.exists(INPUT_FILE):
         use_existing = input(f"\n📁 Existing input file '{INPUT_FILE}' found. Use this? (y/n): ").strip().lower()
         if use_existing == 'y':
-            with open(INPUT_FILE, 'r') as f:
-                return json.load(f)['funds']
+            return [dict(fund) for fund in _read_input_file(INPUT_FILE, os.path.getmtime(INPUT_FILE))]
 
     num_funds = int(input("Enter number of mutual funds to analyze: "))
     funds = []
@@ -32,79 +40,68 @@ def get_user_input_or_load_file():
 def calculate_cagr(start_nav, end_nav, years):
     return (end_nav / start_nav) ** (1 / years) - 1 if years > 0 else 0
 
-def calculate_estimated_amount(cagr, years, initial_investment):
-    return initial_investment * (1 + cagr) ** years
-
-def analyze_fund(url, sip_day, sip_amount, years):
-    response = requests.get(url)
-    data = response.json()
-    scheme_name = data['meta']['scheme_name']
-
-    df = pd.DataFrame(data['data'])
-    df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y')
-    df['nav'] = pd.to_numeric(df['nav'])
-    df = df.sort_values('date').reset_index(drop=True)
-
-    sip_start_date = df['date'].max() - pd.DateOffset(years=years)
-    sip_end_date = df['date'].max()
-
-    sip_investments = []
-    current = datetime(sip_start_date.year, sip_start_date.month, 1)
-    months_to_invest = years * 12
-    months_done = 0
-
-    while months_done < months_to_invest and current <= sip_end_date:
-        try:
-            invest_date = current.replace(day=sip_day)
-        except ValueError:
-            current += timedelta(days=32)
-            current = current.replace(day=1)
-            continue
-
-        nav_row = df[df['date'] >= invest_date]
-        if not nav_row.empty:
-            sip_investments.append(nav_row.iloc[0])
-            months_done += 1
-
-        next_month = current.month + 1 if current.month < 12 else 1
-        next_year = current.year if current.month < 12 else current.year + 1
-        current = datetime(next_year, next_month, 1)
-
-    if len(sip_investments) < 12:
+def fetch_all(urls):
+    # Downloads are independent, so overlap them; results keep the input order
+    unique_urls = list(dict.fromkeys(urls))
+    with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(unique_urls))) as executor:
+        return dict(zip(unique_urls, executor.map(load_nav, unique_urls)))
+
+def analyze_fund(scheme_name, df, sip_day, sip_amount, years):
+    sip_end_date = final_date = df['date'].iat[-1]
+    final_nav = df['nav'].iat[-1]
+    sip_start_date = final_date - pd.DateOffset(years=years)
+
+    dates = df['date'].values
+    inv_navs = sip_amount / df['nav'].to_numpy(dtype=np.float64)
+
+    # Every month from the start month to the last NAV month, generated up front
+    sip_months = pd.period_range(sip_start_date.to_period('M'), sip_end_date.to_period('M'), freq='M').to_timestamp()
+    # Keep only months that contain the SIP day: none for days below 1, and
+    # short months (e.g. April for the 31st) drop out
+    sip_months = sip_months[(1 <= sip_day) & (sip_months.days_in_month >= sip_day)]
+    invest_dates = (sip_months + pd.Timedelta(days=sip_day - 1)).values.astype(dates.dtype)
+
+    # Dates are sorted, so all instalments resolve with one binary search; dates
+    # past the last NAV have no match and only the first years * 12 are invested
+    idxs = np.searchsorted(dates, invest_dates, side='left')
+    sip_idxs = idxs[idxs < len(dates)][:years * 12]
+
+    if len(sip_idxs) < 12:
         print(f"❌ Not enough data to simulate SIP for {scheme_name}")
         return None, None
 
-    sip_df = pd.DataFrame(sip_investments)
-    total_units = (sip_amount / sip_df['nav']).sum()
-    total_invested = len(sip_df) * sip_amount
-    final_value = total_units * df.iloc[-1]['nav']
-    actual_years = (df.iloc[-1]['date'] - sip_df.iloc[0]['date']).days / 365.25
+    total_units = inv_navs.take(sip_idxs).sum()
+    total_invested = len(sip_idxs) * sip_amount
+    final_value = total_units * final_nav
+    actual_years = (final_date - pd.Timestamp(dates[sip_idxs[0]])).days / 365.25
     cagr = calculate_cagr(total_invested, final_value, actual_years)
 
+    # Raw numbers; formatting happens only when the tables are printed
     return {
         'Fund': scheme_name,
-        'CAGR (%)': round(cagr * 100, 2),
-        'Final Value (₹)': f"{final_value:,.2f}",
-        'Total Invested (₹)': f"{total_invested:,.2f}"
+        'CAGR': cagr,
+        'FinalValue': final_value,
+        'TotalInvested': total_invested
     }, (df, final_value)
 
 def apply_resting_period(df, invested_amount, years):
     if years <= 0:
         return invested_amount, 0
 
-    df = df.sort_values('date')
-    end_date = df['date'].max()
-    start_date = end_date - pd.DateOffset(years=years)
-    resting_df = df[df['date'] >= start_date]
+    # Binary search for the first NAV inside the resting window
+    dates = df['date'].values
+    navs = df['nav'].to_numpy()
+    start_date = df['date'].iat[-1] - pd.DateOffset(years=years)
+    start_idx = np.searchsorted(dates, np.datetime64(start_date), side='left')
 
-    if resting_df.empty:
+    if start_idx >= len(dates):
         return invested_amount, 0
 
-    start_nav = resting_df.iloc[0]['nav']
-    end_nav = resting_df.iloc[-1]['nav']
+    start_nav = navs[start_idx]
+    end_nav = navs[-1]
     cagr = calculate_cagr(start_nav, end_nav, years)
-    rested_value = calculate_estimated_amount(cagr, years, invested_amount)
-    return rested_value, round(cagr * 100, 2)
+    rested_value = estimated_amount_from_navs(start_nav, end_nav, invested_amount)
+    return rested_value, cagr
 
 def main():
     funds = get_user_input_or_load_file()
@@ -114,13 +111,16 @@ def main():
     total_final_value = 0.0
     total_rested_value = 0.0
 
+    navs = fetch_all([fund['url'] for fund in funds]) if funds else {}
+
     for fund in funds:
         print(f"\n🔍 Analyzing fund...")
-        result, meta = analyze_fund(fund['url'], fund['sip_day'], fund['sip_amount'], fund['years'])
+        scheme_name, df = navs[fund['url']]
+        result, meta = analyze_fund(scheme_name, df, fund['sip_day'], fund['sip_amount'], fund['years'])
         if result:
             results.append(result)
-            total_invested += float(result['Total Invested (₹)'].replace(',', ''))
-            total_final_value += float(result['Final Value (₹)'].replace(',', ''))
+            total_invested += result['TotalInvested']
+            total_final_value += result['FinalValue']
 
             resting_years = int(input(f"Enter resting period (years) for '{result['Fund']}' (0 for none): "))
             if resting_years > 0:
@@ -128,18 +128,33 @@ def main():
                 rested_value, resting_cagr = apply_resting_period(df, final_value, resting_years)
                 resting_results.append({
                     'Fund': result['Fund'],
-                    'Invested Amount (₹)': f"{final_value:,.2f}",
-                    'Rested Value (₹)': f"{rested_value:,.2f}",
-                    'Resting Period CAGR (%)': resting_cagr
+                    'InvestedAmount': final_value,
+                    'RestedValue': rested_value,
+                    'RestingCAGR': resting_cagr
                 })
                 total_rested_value += rested_value
 
     print("\n📊 SIP Fund Results:")
-    print(tabulate(results, headers="keys", tablefmt="fancy_grid"))
+    display = [{
+        'Fund': r['Fund'],
+        'CAGR (%)': round(r['CAGR'] * 100, 2),
+        'Final Value (₹)': f"{r['FinalValue']:,.2f}",
+        'Total Invested (₹)': f"{r['TotalInvested']:,.2f}"
+    } for r in results]
+    if display:
+        print(pd.DataFrame(display).to_string(index=False))
+    else:
+        print("No fund had enough NAV history to simulate its SIP.")
 
     if resting_results:
         print("\n📊 Resting Period Fund Results:")
-        print(tabulate(resting_results, headers="keys", tablefmt="fancy_grid"))
+        display = [{
+            'Fund': r['Fund'],
+            'Invested Amount (₹)': f"{r['InvestedAmount']:,.2f}",
+            'Rested Value (₹)': f"{r['RestedValue']:,.2f}",
+            'Resting Period CAGR (%)': round(r['RestingCAGR'] * 100, 2)
+        } for r in resting_results]
+        print(pd.DataFrame(display).to_string(index=False))
 
     if results:
         total_cagr = calculate_cagr(total_invested, total_final_value, funds[0]['years'])
@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import cagr_calculation
+from cagr_calculation import print_advertised_cagr, simulate_sip
+
+
+def _nav_frame(end, days, navs):
+    dates = pd.date_range(end=end, periods=days, freq='D')
+    return pd.DataFrame({'date': dates.values.astype('datetime64[ns]'), 'nav': navs})
+
+
+def test_stale_history_skips_lookbacks_after_last_nav(capsys):
+    end = pd.Timestamp(datetime.now() - timedelta(days=400)).normalize()
+    df = _nav_frame(end, 2000, np.linspace(10.0, 20.0, 2000))
+
+    print_advertised_cagr(df)
+
+    out = capsys.readouterr().out
+    assert '1-Year CAGR' not in out
+    assert '5-Year CAGR' in out
+    assert 'Since' in out
+
+
+def test_flat_nav_still_prints_zero_cagr(capsys):
+    end = pd.Timestamp(datetime.now()).normalize()
+    df = _nav_frame(end, 800, np.full(800, 10.0))
+
+    print_advertised_cagr(df)
+
+    out = capsys.readouterr().out
+    assert '1-Year CAGR: 0.00% → ₹5,00,000 → ₹500,000.00' in out
+    assert '5-Year CAGR' not in out
+
+
+def test_start_after_last_nav_gives_empty_table():
+    end = pd.Timestamp('2024-06-28')
+    df = _nav_frame(end, 1000, np.linspace(10.0, 20.0, 1000))
+
+    assert simulate_sip(df, end + pd.DateOffset(years=2), 50000) == {}
+
+
+def test_run_without_sip_dates_prints_message_not_empty_frame(monkeypatch, capsys):
+    df = _nav_frame(pd.Timestamp('2024-06-28'), 1000, np.linspace(10.0, 20.0, 1000))
+    monkeypatch.setattr(cagr_calculation, 'load_nav', lambda url: ('Fund', df))
+
+    assert cagr_calculation.run('url', '0', '2') == []
+
+    out = capsys.readouterr().out
+    assert 'No SIP dates with at least 12 instalments in the selected period.' in out
+    assert 'Empty DataFrame' not in out
+
+
+@pytest.fixture
+def gappy_nav_df():
+    # Business days with random multi-day gaps, so SIP dates fall on weekends,
+    # holidays and days missing from short months
+    rng = np.random.default_rng(7)
+    dates = pd.bdate_range('2015-01-15', '2024-06-28')
+    dates = dates[rng.random(dates.size) > 0.15]
+    navs = 10.0 * np.cumprod(1 + rng.normal(0.0004, 0.01, dates.size))
+    return pd.DataFrame({'date': dates.values.astype('datetime64[ns]'), 'nav': navs})
+
+
+def test_numpy_sweep_matches_numba_sweep(monkeypatch, gappy_nav_df):
+    if cagr_calculation.njit is None:
+        pytest.skip("numba not installed")
+    start = pd.Timestamp('2019-02-28')
+
+    compiled = simulate_sip(gappy_nav_df, start, 50000)
+    monkeypatch.setattr(cagr_calculation, 'njit', None)
+    fallback = simulate_sip(gappy_nav_df, start, 50000)
+
+    assert fallback == compiled
+    assert len(fallback) == 31
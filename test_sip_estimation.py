@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import sip_estimation
+from sip_estimation import analyze_fund
+
+
+@pytest.fixture
+def nav_df():
+    dates = pd.bdate_range('2018-01-01', '2024-12-31')
+    return pd.DataFrame({'date': dates.values.astype('datetime64[ns]'), 'nav': np.linspace(10.0, 30.0, dates.size)})
+
+
+@pytest.mark.parametrize('sip_day', [0, -1, 32])
+def test_invalid_sip_day_has_no_instalments(nav_df, sip_day):
+    result, meta = analyze_fund('Fund', nav_df, sip_day, 1000, 5)
+    assert result is None and meta is None
+
+
+def test_sip_day_31_skips_short_months(nav_df):
+    result, _ = analyze_fund('Fund', nav_df, 31, 1000, 5)
+    # Dec 2019 through Dec 2024: 36 of those 61 months have a 31st
+    assert result['TotalInvested'] == 36 * 1000
+
+
+def test_main_without_results_prints_message_not_empty_frame(monkeypatch, capsys, nav_df):
+    funds = [{'url': 'url', 'sip_day': 0, 'sip_amount': 1000, 'years': 5}]
+    monkeypatch.setattr(sip_estimation, 'get_user_input_or_load_file', lambda: funds)
+    monkeypatch.setattr(sip_estimation, 'fetch_all', lambda urls: {'url': ('Fund', nav_df)})
+
+    sip_estimation.main()
+
+    out = capsys.readouterr().out
+    assert 'No fund had enough NAV history to simulate its SIP.' in out
+    assert 'Empty DataFrame' not in out